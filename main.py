@@ -1,5 +1,5 @@
 # This script finds and manages duplicate files in a directory.
-# It identifies duplicates using MD5 hashing and supports:
+# It identifies duplicates using BLAKE3 or xxHash hashing (MD5 when neither is installed) and supports:
 # - Parallel processing for improved performance
 # - Multiple output formats (txt, json, csv)
 # - Size-based filtering
@@ -9,18 +9,25 @@
 import argparse
 import csv
 import hashlib
+import heapq
 import json
 import logging
+import mmap
 import multiprocessing
 import os
+import re
+import sqlite3
 import sys
+import threading
 import time
 from collections import defaultdict
-from multiprocessing import Pool
-from typing import Dict, List, Optional, Tuple
+from concurrent.futures import FIRST_COMPLETED, Executor, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from contextlib import closing, nullcontext
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
 import humanize
 from rich.console import Console
+from rich.logging import RichHandler
 from rich.panel import Panel
 from rich.progress import (
     BarColumn,
@@ -31,6 +38,65 @@ from rich.progress import (
 )
 from rich.table import Table
 
+try:
+    import blake3
+except ImportError:  # optional dependency, see the "fast" extra in pyproject.toml
+    blake3 = None
+
+try:
+    import xxhash
+except ImportError:  # optional dependency, see the "fast" extra in pyproject.toml
+    xxhash = None
+
+try:
+    import orjson
+except ImportError:  # optional dependency, see the "fast" extra in pyproject.toml
+    orjson = None
+
+HASH_ALGORITHMS = ("blake3", "xxh3", "md5", "sha1", "sha256")
+if blake3 is not None:
+    DEFAULT_HASH_ALGORITHM = "blake3"
+elif xxhash is not None:
+    DEFAULT_HASH_ALGORITHM = "xxh3"
+else:
+    DEFAULT_HASH_ALGORITHM = "md5"
+
+# Files larger than this are hashed with BLAKE3's multithreaded mode
+BLAKE3_THREADED_THRESHOLD = 1024 * 1024
+
+# Files at least this large are memory-mapped and hashed in a single update() call
+MMAP_THRESHOLD = 4 * 1024 * 1024
+
+# Files larger than this are split into lanes hashed concurrently (see calculate_file_digest_p8)
+PARALLEL_HASH_THRESHOLD = 64 * 1024 * 1024
+PARALLEL_HASH_LANES = 8
+
+WORKERS_MODES = ("threads", "processes")
+
+# Number of duplicate sets listed in the "Biggest Space Wasters" table
+TOP_DUPLICATE_SETS = 10
+
+# Flags for reading files through bare descriptors (O_BINARY only exists, and matters, on Windows)
+READ_FLAGS = os.O_RDONLY | getattr(os, "O_BINARY", 0)
+
+# Per-thread read buffers reused across files, see FileProcessor.read_buffer
+_thread_local = threading.local()
+
+# Write buffer for exported results, so large reports are written in few system calls
+EXPORT_BUFFER_SIZE = 1024 * 1024
+
+# confirm_duplicates compares files against a reference this many at a time, which bounds
+# the descriptors each worker holds open, reading this many bytes per file and step
+VERIFY_OPEN_FILES = 8
+VERIFY_BLOCK_SIZE = 256 * 1024
+
+# Number of files sampled per task while the scan is running
+HEAD_BATCH_SIZE = 256
+
+# Candidates are first compared on a hash of windows of this many bytes taken
+# from the start, the middle and the end of the file
+HEAD_HASH_SIZE = 65536
+
 
 class SizeParser:
     """Utility class for parsing human-readable file sizes."""
@@ -41,6 +107,7 @@ class SizeParser:
         "G": 1024**3,
         "T": 1024**4,
     }
+    SIZE_PATTERN = re.compile(r"(\d+)(?:([KMGT])?B)?")
 
     @staticmethod
     def parse_size(size_str: str) -> int:
@@ -57,81 +124,719 @@ class SizeParser:
         """
         size_str = size_str.upper()
 
-        # Handle special case for 0B
-        if size_str == "0B":
-            return 0
+        # Plain bytes ("100", "100B") or a unit followed by B ("10KB", "5MB")
+        match = SizeParser.SIZE_PATTERN.fullmatch(size_str)
+        if match:
+            value, unit = match.groups()
+            return int(value) * SizeParser.UNITS.get(unit, 1)
 
-        # Handle plain bytes or numeric value
-        if size_str.isdigit():
-            return int(size_str)
+        raise ValueError(f"Invalid size format: {size_str}")
 
-        if size_str.endswith("B"):
-            # Handle plain bytes (e.g., "1B", "100B")
-            if size_str[:-1].isdigit():
-                return int(size_str[:-1])
 
-            # Handle KB, MB, GB, TB
-            if len(size_str) > 2 and not size_str[-2].isdigit():
-                size_str = size_str[:-1]  # Remove 'B' for unit processing
-                unit = size_str[-1]
-                if unit in SizeParser.UNITS and size_str[:-1].isdigit():
-                    return int(size_str[:-1]) * SizeParser.UNITS[unit]
+class HashCache:
+    """Persistent SQLite store of full file digests, reused across runs.
 
-        raise ValueError(f"Invalid size format: {size_str}")
+    Entries are keyed on the absolute file path and hash algorithm, and are only
+    used while the file keeps the size and modification time it had when hashed.
+    """
+
+    def __init__(self, cache_path: str, hash_algorithm: str):
+        self.hash_algorithm = hash_algorithm
+        # Files that missed the cache, mapped to the (size, mtime_ns) to store with their digest
+        self.pending: Dict[str, Tuple[int, int]] = {}
+        self.connection = sqlite3.connect(cache_path)
+        # Paths are stored as bytes, file names need not be valid UTF-8
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS file_hashes ("
+            "path BLOB NOT NULL, algorithm TEXT NOT NULL, size INTEGER NOT NULL, "
+            "mtime_ns INTEGER NOT NULL, digest BLOB NOT NULL, PRIMARY KEY (path, algorithm))"
+        )
+
+    def get(self, filepath: str, file_size: int) -> Optional[bytes]:
+        """Look up the stored digest of a file.
+
+        Args:
+            filepath: Path to the file
+            file_size: Size of the file in bytes, as recorded during the scan
+
+        Returns:
+            Optional[bytes]: Stored digest, None if the file is not in the cache or changed since
+        """
+        try:
+            mtime_ns = os.stat(filepath).st_mtime_ns
+        except OSError:
+            return None
+
+        row = self.connection.execute(
+            "SELECT digest FROM file_hashes WHERE path = ? AND algorithm = ? AND size = ? AND mtime_ns = ?",
+            (os.fsencode(os.path.abspath(filepath)), self.hash_algorithm, file_size, mtime_ns),
+        ).fetchone()
+        if row is None:
+            self.pending[filepath] = (file_size, mtime_ns)
+            return None
+        return row[0]
+
+    def put(self, hash_map: Dict[Tuple[int, bytes], List[str]]) -> None:
+        """Store the digests of files that missed the cache.
+
+        Args:
+            hash_map: Mapping of (size, file digest) to file paths, as returned by process_batch
+        """
+        rows = []
+        for (_, file_hash), paths in hash_map.items():
+            for filepath in paths:
+                if filepath in self.pending:
+                    file_size, mtime_ns = self.pending.pop(filepath)
+                    path = os.fsencode(os.path.abspath(filepath))
+                    rows.append((path, self.hash_algorithm, file_size, mtime_ns, file_hash))
+        with self.connection:
+            self.connection.executemany("INSERT OR REPLACE INTO file_hashes VALUES (?, ?, ?, ?, ?)", rows)
+
+    def close(self) -> None:
+        """Close the database."""
+        self.connection.close()
 
 
 class FileProcessor:
     """Handles file processing operations for duplicate detection."""
 
-    def __init__(self, block_size: int = 65536):
+    def __init__(
+        self,
+        block_size: int = 1024 * 1024,
+        hash_algorithm: str = DEFAULT_HASH_ALGORITHM,
+        workers_mode: str = "threads",
+        workers: Optional[int] = None,
+        cache_path: Optional[str] = None,
+        drop_page_cache: bool = False,
+        verify: bool = False,
+    ):
+        if hash_algorithm not in HASH_ALGORITHMS:
+            raise ValueError(f"Unsupported hash algorithm: {hash_algorithm}")
+        if workers_mode not in WORKERS_MODES:
+            raise ValueError(f"Unsupported workers mode: {workers_mode}")
+        if workers is not None and workers < 1:
+            raise ValueError(f"Invalid number of workers: {workers}")
+        if hash_algorithm == "blake3" and blake3 is None:
+            raise ValueError("The blake3 hash algorithm requires the 'blake3' package")
+        if hash_algorithm == "xxh3" and xxhash is None:
+            raise ValueError("The xxh3 hash algorithm requires the 'xxhash' package")
+
         self.block_size = block_size
+        self.hash_algorithm = hash_algorithm
+        self.workers_mode = workers_mode
+        cpu_count = multiprocessing.cpu_count()
+        # The defaults suit SSDs; spinning disks are fastest with about four readers per
+        # volume, beyond that extra workers only add seeks (see --workers / DF_IO_WORKERS)
+        if workers is not None:
+            self.max_workers = workers
+        else:
+            self.max_workers = cpu_count if workers_mode == "processes" else min(32, 4 * cpu_count)
+        self.scan_workers = min(32, 4 * cpu_count)
+        self.cache_path = cache_path
+        self.drop_page_cache = drop_page_cache
+        self.verify = verify
+        self.hardlinks_skipped = 0
         self.logger = logging.getLogger(__name__)
 
+    def new_hasher(self, size: int = 0):
+        """Create a new hash object for the configured algorithm.
+
+        Args:
+            size: Size of the data that will be hashed, used to enable
+                BLAKE3's multithreaded mode for large files
+
+        Returns:
+            A hash object exposing update() and digest()
+        """
+        if self.hash_algorithm == "blake3":
+            if size > BLAKE3_THREADED_THRESHOLD:
+                return blake3.blake3(max_threads=blake3.blake3.AUTO)
+            return blake3.blake3()
+        if self.hash_algorithm == "xxh3":
+            return xxhash.xxh3_128()
+        return hashlib.new(self.hash_algorithm)
+
     def calculate_file_hash(self, filepath: str) -> str:
-        """Calculate MD5 hash of a file using block-wise reading.
+        """Calculate the hash of a file as a hexadecimal string.
 
         Args:
             filepath: Path to the file to hash
 
         Returns:
-            str: Hexadecimal MD5 hash of the file
+            str: Hexadecimal hash of the file
 
         Raises:
             IOError: If file cannot be read
             OSError: If file access fails
         """
-        md5 = hashlib.md5()
+        return self.calculate_file_digest(filepath).hex()
+
+    def calculate_file_digest(self, filepath: str, file_size: Optional[int] = None) -> bytes:
+        """Calculate the raw digest of a file.
+
+        The read strategy adapts to the file size: files smaller than
+        block_size are hashed from a single read, large files are
+        memory-mapped so the whole buffer is hashed in C in a single call
+        (by BLAKE3's own update_mmap when it is the configured algorithm),
+        and everything in between is read block by block into the calling
+        thread's reusable buffer instead of allocating bytes per block.
+        When the caller already knows the size, small files are read through
+        a bare descriptor, skipping the file object and the fstat call.
+
+        Args:
+            filepath: Path to the file to hash
+            file_size: Size of the file in bytes if already known, e.g. from the scan
+
+        Returns:
+            bytes: Digest of the file
+
+        Raises:
+            IOError: If file cannot be read
+            OSError: If file access fails
+        """
+        if file_size is not None and file_size < self.block_size:
+            hasher = self.new_hasher(file_size)
+            fd = os.open(filepath, READ_FLAGS)
+            try:
+                hasher.update(self._read_exactly(fd, file_size))
+            finally:
+                os.close(fd)
+            return hasher.digest()
+
+        with open(filepath, "rb", buffering=0) as f:
+            file_size = os.fstat(f.fileno()).st_size
+            hasher = self.new_hasher(file_size)
+
+            try:
+                if file_size >= MMAP_THRESHOLD:
+                    if self.hash_algorithm == "blake3":
+                        # BLAKE3 maps the file itself and hashes it without holding the GIL
+                        hasher.update_mmap(filepath)
+                        return hasher.digest()
+                    try:
+                        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                            if hasattr(mmap, "MADV_SEQUENTIAL"):
+                                mm.madvise(mmap.MADV_SEQUENTIAL)
+                            hasher.update(mm)
+                        return hasher.digest()
+                    except (ValueError, OSError):
+                        # Empty or unmappable file, fall back to regular reads
+                        self.logger.debug(f"Could not memory-map {filepath}, reading it instead")
+
+                if file_size < self.block_size:
+                    hasher.update(f.read())
+                    return hasher.digest()
+
+                if hasattr(os, "posix_fadvise"):
+                    # Ask the kernel for aggressive readahead on this file, and to start reading
+                    # all of it now; files on this path are smaller than MMAP_THRESHOLD
+                    os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                    os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_WILLNEED)
+
+                buffer = self.read_buffer()
+                while size := f.readinto(buffer):
+                    hasher.update(buffer[:size])
+                return hasher.digest()
+            finally:
+                if file_size >= self.block_size:
+                    self.release_page_cache(f.fileno())
+
+    def release_page_cache(self, fd: int) -> None:
+        """Drop the cached pages of a fully hashed file if drop_page_cache is enabled.
+
+        Hashing a large tree otherwise fills the page cache with data that is
+        not read again, evicting the working set of other programs.
+
+        Args:
+            fd: File descriptor of the hashed file
+        """
+        if self.drop_page_cache and hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+
+    def read_buffer(self) -> memoryview:
+        """Return the calling thread's block_size read buffer, allocating it on first use.
+
+        Returns:
+            memoryview: Writable buffer of block_size bytes
+        """
+        buffer = getattr(_thread_local, "read_buffer", None)
+        if buffer is None or len(buffer) != self.block_size:
+            buffer = _thread_local.read_buffer = memoryview(bytearray(self.block_size))
+        return buffer
+
+    def calculate_file_digest_p8(self, filepath: str) -> bytes:
+        """Calculate a lane-parallel hash of a large file, in the spirit of rsync's MD5P8.
+
+        The memory-mapped file is split into PARALLEL_HASH_LANES contiguous lanes
+        that are hashed on separate threads (hashlib and blake3 release the GIL),
+        then the lane digests are hashed together. The result is only comparable
+        with other digests produced by this method, so callers must pick it based
+        on file size alone to keep equal files on the same scheme.
+
+        Args:
+            filepath: Path to the file to hash
+
+        Returns:
+            bytes: Combined digest of the file
+
+        Raises:
+            IOError: If file cannot be read
+            OSError: If file access fails
+            ValueError: If the file has become empty since the scan and cannot be memory-mapped
+        """
         with open(filepath, "rb") as f:
-            while True:
-                data = f.read(self.block_size)
-                if not data:
-                    break
-                md5.update(data)
-        return md5.hexdigest()
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                lane_size = -(-len(mm) // PARALLEL_HASH_LANES)
+                lanes = [self.new_hasher() for _ in range(PARALLEL_HASH_LANES)]
+
+                def hash_lane(index: int) -> None:
+                    with memoryview(mm) as view:
+                        lanes[index].update(view[index * lane_size : (index + 1) * lane_size])
+
+                with ThreadPoolExecutor(max_workers=PARALLEL_HASH_LANES) as executor:
+                    list(executor.map(hash_lane, range(PARALLEL_HASH_LANES)))
+            self.release_page_cache(f.fileno())
+
+        combined = self.new_hasher()
+        for lane in lanes:
+            combined.update(lane.digest())
+        return combined.digest()
+
+    def create_executor(self) -> Executor:
+        """Create the worker pool used to hash files.
+
+        Hashing releases the GIL, so threads avoid the pickling and process
+        start-up costs of a process pool. Processes remain available for
+        CPU-bound runs on fast local storage; where supported they are
+        started from a fork server, since forking this process after the
+        scan threads have run is unsafe.
+
+        Returns:
+            Executor: Thread or process pool depending on workers_mode
+        """
+        if self.workers_mode == "processes":
+            self.logger.info(f"Processing files using {self.max_workers} processes...")
+            if "forkserver" in multiprocessing.get_all_start_methods():
+                return ProcessPoolExecutor(
+                    max_workers=self.max_workers, mp_context=multiprocessing.get_context("forkserver")
+                )
+            return ProcessPoolExecutor(max_workers=self.max_workers)
 
-    def process_file(self, file_info: Tuple[str, int]) -> Optional[Tuple[str, str, int]]:
+        self.logger.info(f"Processing files using {self.max_workers} threads...")
+        return ThreadPoolExecutor(max_workers=self.max_workers)
+
+    def open_cache(self):
+        """Open the hash cache stored at cache_path.
+
+        Returns:
+            Context manager yielding the HashCache, or None if no cache_path was given
+        """
+        if self.cache_path is None:
+            return nullcontext()
+        return closing(HashCache(self.cache_path, self.hash_algorithm))
+
+    def map_batched(self, executor: Executor, batch_func: Callable, items: List[Tuple]) -> Iterator:
+        """Run batch_func over items on the executor, dispatching them in batches.
+
+        Sending several files per task amortizes pickling (process pool) and
+        future bookkeeping (thread pool); about four batches per worker keeps
+        the load balanced.
+
+        Args:
+            executor: Executor created by create_executor
+            batch_func: Function processing a list of items, such as process_batch
+            items: Items to split into batches
+
+        Returns:
+            Iterator: Results of batch_func, one per batch
+        """
+        batch_size = max(1, len(items) // (self.max_workers * 4))
+        batches = [items[i : i + batch_size] for i in range(0, len(items), batch_size)]
+        return executor.map(batch_func, batches)
+
+    def process_file_head(self, file_info: Tuple[str, int]) -> Optional[Tuple[int, bytes, str]]:
+        """Hash a sample of a file: HEAD_HASH_SIZE bytes from its start, middle and end.
+
+        Files of the same size often share a header (container formats, disk
+        images), so the middle and end windows are what usually tell them apart.
+        For files no larger than HEAD_HASH_SIZE the result equals the full file digest.
+
+        Args:
+            file_info: Tuple containing (filepath, file_size)
+
+        Returns:
+            Optional[Tuple[int, bytes, str]]: Tuple of (size, head_digest, filepath),
+                                          None if the file cannot be read
+        """
+        filepath, file_size = file_info
+        try:
+            hasher = self.new_hasher()
+            # A bare descriptor skips building a file object, which dominates the cost for small files
+            fd = os.open(filepath, READ_FLAGS)
+            try:
+                if file_size <= HEAD_HASH_SIZE:
+                    hasher.update(self._read_exactly(fd, file_size))
+                else:
+                    for offset in (0, file_size // 2, file_size - HEAD_HASH_SIZE):
+                        os.lseek(fd, offset, os.SEEK_SET)
+                        hasher.update(self._read_exactly(fd, HEAD_HASH_SIZE))
+            finally:
+                os.close(fd)
+            return (file_size, hasher.digest(), filepath)
+        except (IOError, OSError) as e:
+            self.logger.error(f"Error processing {filepath}: {str(e)}")
+            return None
+
+    @staticmethod
+    def _read_exactly(fd: int, size: int) -> bytes:
+        """Read up to size bytes from a file descriptor, stopping early only at end of file.
+
+        Args:
+            fd: File descriptor to read from
+            size: Number of bytes to read
+
+        Returns:
+            bytes: Data read, shorter than size only if the file ended first
+        """
+        data = os.read(fd, size)
+        # Local file systems only return short reads at end of file, some network file systems do not
+        while 0 < len(data) < size:
+            chunk = os.read(fd, size - len(data))
+            if not chunk:
+                break
+            data += chunk
+        return data
+
+    def process_file(self, file_info: Tuple[str, int, int]) -> Optional[Tuple[bytes, str, int]]:
         """Process a single file by calculating its hash if it meets size criteria.
 
         Args:
-            file_info: Tuple containing (filepath, minimum_size)
+            file_info: Tuple containing (filepath, file_size, minimum_size), where
+                file_size was already obtained while scanning the directory
 
         Returns:
-            Optional[Tuple[str, str, int]]: Tuple of (hash, filepath, size) if file meets criteria,
+            Optional[Tuple[bytes, str, int]]: Tuple of (digest, filepath, size) if file meets criteria,
                                           None if file is too small or cannot be processed
         """
-        filepath, min_size = file_info
-        try:
-            file_size = os.path.getsize(filepath)
-            if file_size < min_size:
+        filepath, file_size, min_size = file_info
+        if file_size < min_size:
+            if self.logger.isEnabledFor(logging.DEBUG):
                 self.logger.debug(f"Skipping {filepath} (size: {file_size} < {min_size})")
-                return None
+            return None
+
+        return self.hash_file(filepath, file_size)
+
+    def hash_file(self, filepath: str, file_size: int) -> Optional[Tuple[bytes, str, int]]:
+        """Calculate the hash of a file already known to meet the size criteria.
+
+        Args:
+            filepath: Path to the file to hash
+            file_size: Size of the file in bytes, as recorded during the scan
 
-            file_hash = self.calculate_file_hash(filepath)
+        Returns:
+            Optional[Tuple[bytes, str, int]]: Tuple of (digest, filepath, size),
+                                          None if the file cannot be processed
+        """
+        try:
+            # BLAKE3 already hashes large inputs on multiple threads
+            if file_size > PARALLEL_HASH_THRESHOLD and self.hash_algorithm != "blake3":
+                file_hash = self.calculate_file_digest_p8(filepath)
+            else:
+                file_hash = self.calculate_file_digest(filepath, file_size)
             return (file_hash, filepath, file_size)
-        except (IOError, OSError) as e:
+        except (IOError, OSError, ValueError) as e:
+            # ValueError: calculate_file_digest_p8 cannot map a file truncated since the scan
             self.logger.error(f"Error processing {filepath}: {str(e)}")
             return None
 
+    def process_head_batch(self, batch: List[Tuple[str, int]]) -> Dict[Tuple[int, bytes], List[str]]:
+        """Hash a sample of each file in a batch and group them locally.
+
+        Args:
+            batch: List of (filepath, file_size) tuples
+
+        Returns:
+            Dict[Tuple[int, bytes], List[str]]: Mapping of (size, head_digest) to file paths
+        """
+        head_map: Dict[Tuple[int, bytes], List[str]] = defaultdict(list)
+        for file_info in batch:
+            result = self.process_file_head(file_info)
+            if result:
+                file_size, head_hash, filepath = result
+                head_map[(file_size, head_hash)].append(filepath)
+        return head_map
+
+    def process_batch(self, batch: List[Tuple[str, int]]) -> Dict[Tuple[int, bytes], List[str]]:
+        """Hash a batch of files and group them locally by hash.
+
+        Grouping inside the worker means the main process merges one small
+        dictionary per batch instead of receiving one result per file. Files
+        are grouped on size as well, since files of different sizes may be
+        hashed with different schemes (see hash_file).
+
+        Args:
+            batch: List of (filepath, file_size) tuples for files already filtered by size
+
+        Returns:
+            Dict[Tuple[int, bytes], List[str]]: Mapping of (size, file digest) to file paths
+        """
+        hash_map: Dict[Tuple[int, bytes], List[str]] = defaultdict(list)
+        for filepath, file_size in batch:
+            result = self.hash_file(filepath, file_size)
+            if result:
+                file_hash, filepath, file_size = result
+                hash_map[(file_size, file_hash)].append(filepath)
+        return hash_map
+
+    def scan_directory(
+        self,
+        directory: str,
+        exclude_dirs: List[str] = None,
+        exclude_extensions: List[str] = None,
+        ignore_dot_dirs: bool = True,
+        follow_symlinks: bool = False,
+    ) -> Iterator[Tuple[str, int]]:
+        """Recursively list the files in a directory along with their sizes.
+
+        Uses os.scandir so file types come from the directory listing and the
+        size from DirEntry.stat(), instead of a separate os.path.getsize call.
+        Directories are listed concurrently on a thread pool, so files are
+        yielded in no particular order. Symbolic links to directories are never
+        followed. Paths sharing an inode (hard links, or symlinks when they are
+        followed) are only yielded once, since they share storage; the number
+        skipped is stored in hardlinks_skipped.
+
+        Args:
+            directory: Root directory to scan
+            exclude_dirs: List of directory paths to exclude from scan
+            exclude_extensions: List of file extensions to exclude (e.g., ['.log', '.tmp'])
+            ignore_dot_dirs: Whether to skip directories starting with a dot
+            follow_symlinks: Whether to include symbolic links to files
+
+        Yields:
+            Tuple[str, int]: (filepath, size) for every file that is not excluded
+        """
+        # Normalize exclude directories to absolute paths. Subdirectories are checked as they are
+        # reached, so an excluded directory prunes its whole subtree and a set lookup per directory
+        # suffices; only the root itself can lie below an excluded directory
+        exclude_paths = {os.path.abspath(d) for d in exclude_dirs or []}
+        abs_directory = os.path.abspath(directory)
+        root_excluded = os.path.join(abs_directory, "").startswith(tuple(os.path.join(d, "") for d in exclude_paths))
+
+        # Normalize exclude extensions to lowercase, dot-prefixed suffixes for str.endswith
+        exclude_suffixes = tuple(
+            ext.lower() if ext.startswith(".") else f".{ext.lower()}" for ext in exclude_extensions or []
+        )
+
+        # Each directory is listed by its own task so metadata I/O for sibling
+        # directories overlaps; os.scandir releases the GIL while it waits
+        with ThreadPoolExecutor(max_workers=self.scan_workers) as executor:
+            pending = set()
+
+            def visit(dirpath: str, abs_dirpath: str) -> None:
+                if abs_dirpath in exclude_paths:
+                    self.logger.info(f"Skipping excluded directory: {dirpath}")
+                    return
+                pending.add(
+                    executor.submit(
+                        self.list_directory,
+                        dirpath,
+                        abs_dirpath,
+                        exclude_suffixes,
+                        ignore_dot_dirs,
+                        follow_symlinks,
+                    )
+                )
+
+            self.hardlinks_skipped = 0
+            seen_inodes = set()
+            log_skipped = self.logger.isEnabledFor(logging.INFO)
+            if root_excluded:
+                self.logger.info(f"Skipping excluded directory: {directory}")
+            else:
+                visit(directory, abs_directory)
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    subdirs, files = future.result()
+                    for subdir in subdirs:
+                        visit(*subdir)
+                    for filepath, file_size, inode in files:
+                        if inode is not None:
+                            if inode in seen_inodes:
+                                if log_skipped:
+                                    self.logger.info(f"Skipping link to an already scanned file: {filepath}")
+                                self.hardlinks_skipped += 1
+                                continue
+                            seen_inodes.add(inode)
+                        yield filepath, file_size
+
+    def list_directory(
+        self,
+        dirpath: str,
+        abs_dirpath: str,
+        exclude_suffixes: Tuple[str, ...],
+        ignore_dot_dirs: bool,
+        follow_symlinks: bool,
+    ) -> Tuple[List[Tuple[str, str]], List[Tuple[str, int, Optional[Tuple[int, int]]]]]:
+        """List a single directory for scan_directory.
+
+        Args:
+            dirpath: Directory to list
+            abs_dirpath: Absolute path of the directory
+            exclude_suffixes: Lowercase file suffixes to skip
+            ignore_dot_dirs: Whether to skip directories starting with a dot
+            follow_symlinks: Whether to include symbolic links to files
+
+        Returns:
+            Tuple containing:
+            - List[Tuple[str, str]]: (path, absolute path) of each subdirectory to visit
+            - List[Tuple[str, int, Optional[Tuple[int, int]]]]: (filepath, size, inode) of each
+              file that is not excluded, where inode is (st_dev, st_ino) for files that may be
+              reachable through another path and None otherwise
+        """
+        subdirs = []
+        files = []
+        # Checked once per directory rather than formatting a message for every skipped file
+        log_skipped = self.logger.isEnabledFor(logging.INFO)
+        try:
+            with os.scandir(dirpath) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if not (ignore_dot_dirs and entry.name.startswith(".")):
+                                subdirs.append((entry.path, os.path.join(abs_dirpath, entry.name)))
+                            continue
+
+                        if not entry.is_file() or (entry.is_symlink() and not follow_symlinks):
+                            continue
+
+                        if exclude_suffixes and entry.name.lower().endswith(exclude_suffixes):
+                            if log_skipped:
+                                self.logger.info(f"Skipping excluded file type: {entry.path}")
+                            continue
+
+                        stat = entry.stat()
+                        inode = None
+                        # Only multiply-linked files (or followed symlinks) can share an inode
+                        # with another path; st_nlink is 0 on platforms that do not report it
+                        if follow_symlinks or stat.st_nlink > 1:
+                            # DirEntry.stat() leaves st_ino and st_dev at 0 on Windows, which
+                            # would give every file the same key; os.stat() fills them in
+                            if not stat.st_ino:
+                                stat = os.stat(entry.path)
+                            if stat.st_ino:
+                                inode = (stat.st_dev, stat.st_ino)
+                        files.append((entry.path, stat.st_size, inode))
+                    except OSError as e:
+                        self.logger.error(f"Error processing {entry.path}: {str(e)}")
+        except OSError as e:
+            self.logger.error(f"Error scanning {dirpath}: {str(e)}")
+
+        return subdirs, files
+
+    def confirm_duplicates(self, duplicate_set: Tuple[int, List[str]]) -> List[List[str]]:
+        """Split a set of files with equal digests into groups of byte-identical files.
+
+        The first file serves as the reference and the others are read in
+        lockstep with it, at most VERIFY_OPEN_FILES at a time. Each of the others
+        is read once, the reference once per such batch. Files that differ from
+        the reference are grouped in further rounds.
+
+        Args:
+            duplicate_set: Tuple of (size, file paths) sharing a digest
+
+        Returns:
+            List[List[str]]: Groups of at least two files with identical contents
+        """
+        _, paths = duplicate_set
+        groups: List[List[str]] = []
+        while len(paths) > 1:
+            reference, *others = paths
+            identical, different = [reference], []
+            try:
+                reference_fd = os.open(reference, READ_FLAGS)
+                try:
+                    for start in range(0, len(others), VERIFY_OPEN_FILES):
+                        same, rest = self._compare_files(reference_fd, others[start : start + VERIFY_OPEN_FILES])
+                        identical.extend(same)
+                        different.extend(rest)
+                finally:
+                    os.close(reference_fd)
+            except OSError as e:
+                self.logger.error(f"Error processing {reference}: {str(e)}")
+                identical, different = [], others
+            if len(identical) > 1:
+                groups.append(identical)
+            paths = different
+        return groups
+
+    def _compare_files(self, reference_fd: int, others: List[str]) -> Tuple[List[str], List[str]]:
+        """Compare files block by block against a reference file.
+
+        Args:
+            reference_fd: Open file descriptor of the reference file, read from the start
+            others: Paths to the files to compare with it
+
+        Returns:
+            Tuple containing:
+            - List[str]: Files identical to the reference
+            - List[str]: Files that differ from it; files that cannot be read are logged and left out
+
+        Raises:
+            OSError: If the reference file cannot be read
+        """
+        fds: Dict[str, int] = {}
+        different: List[str] = []
+        os.lseek(reference_fd, 0, os.SEEK_SET)
+        try:
+            for filepath in others:
+                try:
+                    fds[filepath] = os.open(filepath, READ_FLAGS)
+                except OSError as e:
+                    self.logger.error(f"Error processing {filepath}: {str(e)}")
+
+            while fds:
+                expected = self._read_exactly(reference_fd, VERIFY_BLOCK_SIZE)
+                for filepath, fd in list(fds.items()):
+                    try:
+                        # bytes equality is a memcmp
+                        if self._read_exactly(fd, VERIFY_BLOCK_SIZE) != expected:
+                            different.append(filepath)
+                            os.close(fds.pop(filepath))
+                    except OSError as e:
+                        self.logger.error(f"Error processing {filepath}: {str(e)}")
+                        os.close(fds.pop(filepath))
+                if not expected:
+                    break
+            return list(fds), different
+        finally:
+            for fd in fds.values():
+                os.close(fd)
+
+    @staticmethod
+    def _flush_duplicates(
+        file_size: int,
+        size_hashes: Dict[bytes, List[str]],
+        duplicate_files: Dict[Tuple[int, bytes], Tuple[int, List[str]]],
+    ) -> int:
+        """Move the duplicate sets of a fully hashed size group into duplicate_files.
+
+        Args:
+            file_size: Size shared by every file in the group
+            size_hashes: Mapping of file digest to paths for that size
+            duplicate_files: Result mapping of (size, file digest) to (size, file paths)
+
+        Returns:
+            int: Space taken by the redundant copies moved into duplicate_files, in bytes
+        """
+        duplicate_count = 0
+        for file_hash, paths in size_hashes.items():
+            if len(paths) > 1:
+                duplicate_files[(file_size, file_hash)] = (file_size, paths)
+                duplicate_count += len(paths) - 1
+        return file_size * duplicate_count
+
     def find_duplicates(
         self,
         directory: str,
@@ -140,7 +845,8 @@ class FileProcessor:
         min_size: int = 0,
         verbose: bool = False,
         ignore_dot_dirs: bool = True,
-    ) -> Tuple[Dict[str, List[str]], int, int, int]:
+        follow_symlinks: bool = False,
+    ) -> Tuple[Dict[Tuple[int, bytes], Tuple[int, List[str]]], int, int, int]:
         """Find duplicate files in the given directory using parallel processing.
 
         Args:
@@ -150,73 +856,151 @@ class FileProcessor:
             min_size: Minimum file size in bytes to consider
             verbose: Whether to enable verbose logging
             ignore_dot_dirs: Whether to skip directories starting with a dot
+            follow_symlinks: Whether to include symbolic links to files
 
         Returns:
             Tuple containing:
-            - Dict[str, List[str]]: Dictionary mapping file hash to list of duplicate file paths
+            - Dict[Tuple[int, bytes], Tuple[int, List[str]]]: Dictionary mapping (size, raw file digest)
+              to the file size and the list of duplicate file paths; files of different sizes are hashed
+              with different schemes (see hash_file), so the digest alone is not a unique key
             - int: Total size of all processed files in bytes
             - int: Total size taken by duplicate files in bytes
-            - int: Number of files processed
+            - int: Number of files processed (scanned files meeting the size criteria)
         """
-        hash_map: Dict[str, List[str]] = defaultdict(list)
         total_size = 0
+        duplicate_size = 0
         files_processed = 0
 
-        # Normalize exclude directories to absolute paths
-        exclude_dirs = exclude_dirs or []
-        exclude_dirs = [os.path.abspath(d) for d in exclude_dirs]
-
-        # Normalize exclude extensions
-        exclude_extensions = exclude_extensions or []
-        exclude_extensions = [ext.lower() for ext in exclude_extensions]
-
-        # Collect all files to process
-        files_to_process = []
-        for root, dirs, files in os.walk(directory):
-            if any(os.path.abspath(root).startswith(d) for d in exclude_dirs):
-                self.logger.info(f"Skipping excluded directory: {root}")
-                continue
-
-            if ignore_dot_dirs:
-                dirs[:] = [d for d in dirs if not d.startswith(".")]
-
-            for filename in files:
-                if exclude_extensions and any(filename.lower().endswith(ext) for ext in exclude_extensions):
-                    self.logger.info(f"Skipping excluded file type: {os.path.join(root, filename)}")
-                    continue
-
-                filepath = os.path.join(root, filename)
-                files_to_process.append((filepath, min_size))
+        duplicate_files: Dict[Tuple[int, bytes], Tuple[int, List[str]]] = {}
+        empty_files: List[str] = []
 
         # Process files in parallel
-        cpu_count = multiprocessing.cpu_count()
-        self.logger.info(f"Processing files using {cpu_count} CPU cores...")
-
-        with Pool(processes=cpu_count) as pool:
-            results = pool.imap_unordered(self.process_file, files_to_process)
+        files_hashed = 0
+        with self.create_executor() as executor, self.open_cache() as cache:
+            # First pass: sample files while the scan is still running. A file whose size is
+            # unique cannot have duplicates, so a size is only sampled once a second file has it;
+            # until then its first file is kept in first_paths
+            first_paths: Dict[int, Optional[str]] = {}
+            head_batch: List[Tuple[str, int]] = []
+            head_futures = []
+            candidates = 0
+            scanned_files = self.scan_directory(
+                directory, exclude_dirs, exclude_extensions, ignore_dot_dirs, follow_symlinks
+            )
+            for filepath, file_size in scanned_files:
+                if file_size < min_size:
+                    if self.logger.isEnabledFor(logging.DEBUG):
+                        self.logger.debug(f"Skipping {filepath} (size: {file_size} < {min_size})")
+                    continue
 
-            for result in results:
-                if result:
-                    file_hash, filepath, file_size = result
-                    hash_map[file_hash].append(filepath)
-                    total_size += file_size
-                    files_processed += 1
+                total_size += file_size
+                files_processed += 1
 
-                    if verbose and files_processed % 100 == 0:
-                        self.logger.info(f"Processed {files_processed} files...")
+                if file_size == 0:
+                    # Empty files are all identical, there is nothing to read
+                    empty_files.append(filepath)
+                    continue
 
-        # Filter out unique files and calculate duplicate size
-        duplicate_files = {h: files for h, files in hash_map.items() if len(files) > 1}
-        duplicate_size = sum(os.path.getsize(files[0]) * (len(files) - 1) for files in duplicate_files.values())
+                if file_size not in first_paths:
+                    first_paths[file_size] = filepath
+                    continue
+                first_path = first_paths[file_size]
+                if first_path is not None:
+                    head_batch.append((first_path, file_size))
+                    first_paths[file_size] = None
+                head_batch.append((filepath, file_size))
+
+                if len(head_batch) >= HEAD_BATCH_SIZE:
+                    candidates += len(head_batch)
+                    head_futures.append(executor.submit(self.process_head_batch, head_batch))
+                    head_batch = []
+
+            if head_batch:
+                candidates += len(head_batch)
+                head_futures.append(executor.submit(self.process_head_batch, head_batch))
+            del first_paths, head_batch
+            self.logger.info(f"Hashing {candidates} of {files_processed} files with non-unique sizes...")
+
+            if len(empty_files) > 1:
+                duplicate_files[(0, self.new_hasher().digest())] = (0, empty_files)
+
+            head_map: Dict[Tuple[int, bytes], List[str]] = defaultdict(list)
+            for future in head_futures:
+                for key, paths in future.result().items():
+                    head_map[key].extend(paths)
+            del head_futures
+
+            # Second pass: fully hash files whose sample still collides
+            files_to_process = []
+            while head_map:
+                (file_size, head_hash), paths = head_map.popitem()
+                if len(paths) < 2:
+                    continue
+                if file_size <= HEAD_HASH_SIZE:
+                    # The sample already covers the whole file
+                    duplicate_files[(file_size, head_hash)] = (file_size, paths)
+                    duplicate_size += file_size * (len(paths) - 1)
+                    continue
+                files_to_process.extend((filepath, file_size) for filepath in paths)
+
+            # Largest files first so they do not end up as stragglers
+            files_to_process.sort(key=lambda file_info: file_info[1], reverse=True)
+
+            hash_map: Dict[int, Dict[bytes, List[str]]] = {}
+            if cache is not None:
+                # Files with a stored digest go straight into hash_map, the rest keep their order
+                files_to_hash = []
+                for filepath, file_size in files_to_process:
+                    file_hash = cache.get(filepath, file_size)
+                    if file_hash is None:
+                        files_to_hash.append((filepath, file_size))
+                    else:
+                        hash_map.setdefault(file_size, defaultdict(list))[file_hash].append(filepath)
+                self.logger.info(f"Reusing cached hashes for {len(files_to_process) - len(files_to_hash)} files")
+                files_to_process = files_to_hash
+
+            # Results arrive in submission order, i.e. by decreasing size, so once a
+            # batch has been merged every larger size is complete and can be flushed
+            for batch_hash_map in self.map_batched(executor, self.process_batch, files_to_process):
+                if cache is not None:
+                    cache.put(batch_hash_map)
+                for (file_size, file_hash), paths in batch_hash_map.items():
+                    hash_map.setdefault(file_size, defaultdict(list))[file_hash].extend(paths)
+                    files_hashed += len(paths)
+
+                if batch_hash_map:
+                    smallest_size = min(file_size for file_size, _ in batch_hash_map)
+                    for file_size in [size for size in hash_map if size > smallest_size]:
+                        duplicate_size += self._flush_duplicates(file_size, hash_map.pop(file_size), duplicate_files)
+
+                if verbose:
+                    self.logger.info(f"Hashed {files_hashed} files...")
+
+            for file_size, size_hashes in hash_map.items():
+                duplicate_size += self._flush_duplicates(file_size, size_hashes, duplicate_files)
+
+            if self.verify:
+                # Equal digests only make identical contents overwhelmingly likely, compare them
+                verified_files: Dict[Tuple[int, bytes], Tuple[int, List[str]]] = {}
+                duplicate_size = 0
+                confirmed_groups = executor.map(self.confirm_duplicates, duplicate_files.values())
+                for ((file_size, file_hash), _), groups in zip(duplicate_files.items(), confirmed_groups):
+                    for index, group in enumerate(groups):
+                        # Files that only shared a digest get a key of their own
+                        key = (file_size, file_hash + index.to_bytes(4, "big") if index else file_hash)
+                        verified_files[key] = (file_size, group)
+                        duplicate_size += file_size * (len(group) - 1)
+                duplicate_files = verified_files
 
         return duplicate_files, total_size, duplicate_size, files_processed
 
 
-def export_to_file(duplicates: Dict[str, List[str]], output_file: str, format: str = "txt") -> None:
+def export_to_file(duplicate_sets: Iterable[Tuple[int, List[str]]], output_file: str, format: str = "txt") -> None:
     """Export duplicate files list to a file in the specified format.
 
     Args:
-        duplicates: Dictionary mapping file hash to list of duplicate file paths
+        duplicate_sets: Iterable of (size, file paths) tuples, one per duplicate set,
+            such as the values of the mapping returned by find_duplicates
         output_file: Path where the output file will be created
         format: Output format, one of 'txt', 'json', or 'csv'
             - txt: Human-readable text format with duplicate sets
@@ -225,29 +1009,37 @@ def export_to_file(duplicates: Dict[str, List[str]], output_file: str, format: s
     """
     logger = logging.getLogger(__name__)
 
+    # Single pass over the sets, each format only decides how a set is written
+    numbered_sets = enumerate(duplicate_sets, 1)
+
     if format == "json":
-        # Convert to a more JSON-friendly format
-        json_data = {
-            "duplicate_sets": [{"size": os.path.getsize(files[0]), "files": files} for files in duplicates.values()]
-        }
-        with open(output_file, "w") as f:
-            json.dump(json_data, f, indent=2)
+        json_data = {"duplicate_sets": [{"size": size, "files": files} for _, (size, files) in numbered_sets]}
+        encoded = None
+        if orjson is not None:
+            try:
+                encoded = orjson.dumps(json_data, option=orjson.OPT_INDENT_2)
+            except orjson.JSONEncodeError:
+                # File names that are not valid in the file system encoding hold surrogate
+                # escapes, which orjson rejects; the json module escapes them instead
+                logger.debug("Falling back to the json module to export non UTF-8 file names")
+        if encoded is not None:
+            with open(output_file, "wb") as f:
+                f.write(encoded)
+        else:
+            with open(output_file, "w", buffering=EXPORT_BUFFER_SIZE) as f:
+                json.dump(json_data, f, indent=2)
 
     elif format == "csv":
-        with open(output_file, "w", newline="") as f:
+        with open(output_file, "w", newline="", buffering=EXPORT_BUFFER_SIZE) as f:
             writer = csv.writer(f)
             writer.writerow(["Set", "Size", "File"])
-            for i, (_, files) in enumerate(duplicates.items(), 1):
-                size = os.path.getsize(files[0])
-                for filepath in files:
-                    writer.writerow([i, size, filepath])
+            writer.writerows([i, size, filepath] for i, (size, files) in numbered_sets for filepath in files)
 
     else:  # txt format
-        with open(output_file, "w") as f:
-            for hash_value, file_list in duplicates.items():
-                f.write(f"\nDuplicate set (size: {humanize.naturalsize(os.path.getsize(file_list[0]))})\n")
-                for filepath in file_list:
-                    f.write(f"  {filepath}\n")
+        with open(output_file, "w", buffering=EXPORT_BUFFER_SIZE) as f:
+            for _, (size, files) in numbered_sets:
+                f.write(f"\nDuplicate set (size: {humanize.naturalsize(size)})\n")
+                f.writelines(f"  {filepath}\n" for filepath in files)
 
     logger.info(f"Results exported to {output_file} in {format} format")
 
@@ -258,17 +1050,6 @@ def setup_logging(verbose: bool = False) -> None:
     Args:
         verbose: Whether to enable debug logging
     """
-    console = Console()
-
-    class RichHandler(logging.Handler):
-        def emit(self, record):
-            try:
-                msg = self.format(record)
-                style = "bold red" if record.levelno >= logging.ERROR else "blue"
-                console.print(f"[{style}]{msg}[/{style}]")
-            except Exception:
-                self.handleError(record)
-
     log_level = logging.DEBUG if verbose else logging.INFO
     logger = logging.getLogger()
     logger.setLevel(log_level)
@@ -276,7 +1057,7 @@ def setup_logging(verbose: bool = False) -> None:
     # Remove existing handlers and add rich handler
     for handler in logger.handlers[:]:
         logger.removeHandler(handler)
-    logger.addHandler(RichHandler())
+    logger.addHandler(RichHandler(console=Console(), markup=False, show_path=False))
 
 
 def main() -> None:
@@ -287,17 +1068,23 @@ def main() -> None:
     - Directory exclusions (-e/--exclude-dir)
     - Extension exclusions (-x/--exclude-ext)
     - Minimum file size (-m/--min-size)
+    - Hash algorithm (--hash)
+    - Worker pool type and size (--workers-mode, --workers)
+    - Persistent hash cache (--cache)
+    - Page cache eviction after hashing (--drop-page-cache)
+    - Byte-by-byte confirmation of duplicates (--verify)
     - Output file and format (-o/--output, --format)
     - Dry run mode (--dry-run)
     - Verbose output (-v/--verbose)
     - Dot directory inclusion (--include-dot-dirs)
+    - Symbolic link inclusion (--follow-symlinks)
 
     Returns:
         None
 
     Exit codes:
         0: Success
-        1: Invalid directory or size format
+        1: Invalid directory, size format, hash algorithm, number of workers or hash cache
     """
     parser = argparse.ArgumentParser(description="Find duplicate files in a directory")
     parser.add_argument("directory", help="Directory to scan for duplicates")
@@ -320,6 +1107,40 @@ def main() -> None:
         default="0B",
         help="Minimum file size to consider (e.g. 10KB, 5MB)",
     )
+    parser.add_argument(
+        "--hash",
+        choices=HASH_ALGORITHMS,
+        default=DEFAULT_HASH_ALGORITHM,
+        help=f"Hash algorithm used to compare files (default: {DEFAULT_HASH_ALGORITHM})",
+    )
+    parser.add_argument(
+        "--workers-mode",
+        choices=WORKERS_MODES,
+        default="threads",
+        help="Hash files on a thread pool (default) or a process pool",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.environ.get("DF_IO_WORKERS"),
+        help="Number of files hashed concurrently (default: $DF_IO_WORKERS, else based on the CPU count; "
+        "about 4 suits spinning disks)",
+    )
+    parser.add_argument(
+        "--cache",
+        metavar="PATH",
+        help="SQLite file in which file hashes are kept between runs, so unchanged files are not read again",
+    )
+    parser.add_argument(
+        "--drop-page-cache",
+        action="store_true",
+        help="Evict files larger than the read block from the page cache once hashed (Linux and other POSIX systems)",
+    )
+    parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="Compare the contents of files with equal hashes before reporting them as duplicates",
+    )
     parser.add_argument(
         "-o",
         "--output",
@@ -344,6 +1165,11 @@ def main() -> None:
         action="store_true",
         help="Include directories that start with a dot (like .git)",
     )
+    parser.add_argument(
+        "--follow-symlinks",
+        action="store_true",
+        help="Include symbolic links to files (links to the same file are only counted once)",
+    )
     args = parser.parse_args()
 
     # Set up rich console
@@ -361,6 +1187,21 @@ def main() -> None:
         console.print("[yellow]Please use formats like: 10KB, 5MB, 1GB[/yellow]")
         sys.exit(1)
 
+    try:
+        file_processor = FileProcessor(
+            hash_algorithm=args.hash,
+            workers_mode=args.workers_mode,
+            workers=args.workers,
+            cache_path=args.cache,
+            drop_page_cache=args.drop_page_cache,
+            verify=args.verify,
+        )
+    except ValueError as e:
+        console.print(f"[bold red]Error:[/bold red] {str(e)}")
+        if (args.hash == "blake3" and blake3 is None) or (args.hash == "xxh3" and xxhash is None):
+            console.print("[yellow]Install the optional hashing packages with: pip install blake3 xxhash[/yellow]")
+        sys.exit(1)
+
     # Create a panel with scan information
     scan_info = Table.grid(padding=1)
     scan_info.add_row("Directory:", args.directory)
@@ -370,6 +1211,7 @@ def main() -> None:
         scan_info.add_row("Excluding extensions:", ", ".join(args.exclude_ext))
     if min_size > 0:
         scan_info.add_row("Minimum file size:", args.min_size)
+    scan_info.add_row("Hash algorithm:", args.hash)
 
     console.print(Panel(scan_info, title="Scan Configuration", border_style="blue"))
 
@@ -377,10 +1219,18 @@ def main() -> None:
         console.print("\n[yellow]DRY RUN[/yellow] - showing what would be scanned without processing files")
         return
 
+    # Open the cache once up front so an unusable path fails before the scan starts
+    # (not on dry runs, since opening it creates the database)
+    if args.cache:
+        try:
+            HashCache(args.cache, args.hash).close()
+        except sqlite3.Error as e:
+            console.print(f"[bold red]Error:[/bold red] Cannot open hash cache '{args.cache}': {str(e)}")
+            sys.exit(1)
+
     console.print("\n[blue]Starting scan...[/blue]")
 
     start_time = time.time()
-    file_processor = FileProcessor()
 
     with Progress(
         SpinnerColumn(),
@@ -397,6 +1247,7 @@ def main() -> None:
             min_size=min_size,
             verbose=args.verbose,
             ignore_dot_dirs=not args.include_dot_dirs,
+            follow_symlinks=args.follow_symlinks,
         )
         progress.update(task, completed=100)
 
@@ -411,9 +1262,11 @@ def main() -> None:
     results_table.add_column("Metric", style="cyan")
     results_table.add_column("Value", style="green")
 
-    duplicate_count = sum(len(files) for files in duplicates.values()) - len(duplicates)
+    duplicate_count = sum(len(files) for _, files in duplicates.values()) - len(duplicates)
     results_table.add_row("Scan Duration", f"{elapsed_time:.2f} seconds")
     results_table.add_row("Files Processed", str(files_processed))
+    if file_processor.hardlinks_skipped:
+        results_table.add_row("Links to Scanned Files Skipped", str(file_processor.hardlinks_skipped))
     results_table.add_row("Duplicate Sets", str(len(duplicates)))
     results_table.add_row("Total Duplicates", str(duplicate_count))
     results_table.add_row("Total Space Used", humanize.naturalsize(total_size))
@@ -422,17 +1275,31 @@ def main() -> None:
 
     console.print("\n", results_table)
 
+    # Sets wasting the most space, i.e. size times the number of redundant copies
+    largest_sets = heapq.nlargest(
+        TOP_DUPLICATE_SETS,
+        duplicates.values(),
+        key=lambda duplicate_set: duplicate_set[0] * (len(duplicate_set[1]) - 1),
+    )
+    wasters_table = Table(title="Biggest Space Wasters", border_style="blue")
+    wasters_table.add_column("Wasted", style="green")
+    wasters_table.add_column("Copies", style="cyan")
+    wasters_table.add_column("File", style="cyan")
+    for size, file_list in largest_sets:
+        wasters_table.add_row(humanize.naturalsize(size * (len(file_list) - 1)), str(len(file_list)), file_list[0])
+
+    console.print("\n", wasters_table)
+
     # Display duplicate sets
     console.print("\n[bold blue]Duplicate Files:[/bold blue]")
-    for hash_value, file_list in duplicates.items():
-        size = humanize.naturalsize(os.path.getsize(file_list[0]))
-        console.print(f"\n[yellow]Duplicate set[/yellow] (size: {size})")
+    for size, file_list in duplicates.values():
+        console.print(f"\n[yellow]Duplicate set[/yellow] (size: {humanize.naturalsize(size)})")
         for filepath in file_list:
             console.print(f"  [green]•[/green] {filepath}")
 
     # Export results if requested
     if args.output:
-        export_to_file(duplicates, args.output, args.format)
+        export_to_file(duplicates.values(), args.output, args.format)
         console.print(
             f"\n[blue]Results exported to[/blue] [green]{args.output}[/green] [blue]in {args.format} format[/blue]"
         )
@@ -6,7 +6,8 @@ from unittest.mock import patch
 
 import pytest
 
-from main import main
+import main as main_module
+from main import export_to_file, main
 
 
 @pytest.fixture
@@ -45,6 +46,69 @@ def test_cli_invalid_size_format():
     assert exc_info.value.code == 1
 
 
+def test_cli_invalid_workers(monkeypatch, capsys):
+    """Test the CLI behavior when given an invalid number of workers.
+
+    Verifies that the program exits with status code 1 for a worker
+    count below one, whether given with --workers or DF_IO_WORKERS,
+    without suggesting to install the optional hashing packages.
+
+    Args:
+        monkeypatch: Pytest fixture for setting the environment variable
+        capsys: Pytest fixture for capturing stdout/stderr
+    """
+    with pytest.raises(SystemExit) as exc_info:
+        with patch("sys.argv", ["duplicate-finder", ".", "--workers", "0", "--hash", "md5"]):
+            main()
+    assert exc_info.value.code == 1
+    captured = capsys.readouterr()
+    assert "Invalid number of workers: 0" in captured.out
+    assert "pip install" not in captured.out
+
+    monkeypatch.setenv("DF_IO_WORKERS", "0")
+    with pytest.raises(SystemExit) as exc_info:
+        with patch("sys.argv", ["duplicate-finder", "."]):
+            main()
+    assert exc_info.value.code == 1
+
+
+def test_cli_missing_hash_package(monkeypatch, capsys):
+    """Test the CLI behavior when the package of the chosen hash algorithm is missing.
+
+    Verifies that the program exits with status code 1 and suggests
+    installing the optional hashing packages.
+
+    Args:
+        monkeypatch: Pytest fixture for hiding the blake3 package
+        capsys: Pytest fixture for capturing stdout/stderr
+    """
+    monkeypatch.setattr(main_module, "blake3", None)
+    with pytest.raises(SystemExit) as exc_info:
+        with patch("sys.argv", ["duplicate-finder", ".", "--hash", "blake3"]):
+            main()
+    assert exc_info.value.code == 1
+    assert "pip install blake3 xxhash" in capsys.readouterr().out
+
+
+def test_cli_invalid_cache(temp_dir):
+    """Test the CLI behavior when the hash cache cannot be opened.
+
+    Verifies that the program exits with status code 1 for a cache path
+    in a missing directory and for a file that is not an SQLite database.
+
+    Args:
+        temp_dir: Pytest fixture providing a temporary directory
+    """
+    not_a_database = temp_dir / "hashes.db"
+    not_a_database.write_text("not a database " * 100)
+
+    for cache_path in (temp_dir / "missing" / "hashes.db", not_a_database):
+        with pytest.raises(SystemExit) as exc_info:
+            with patch("sys.argv", ["duplicate-finder", str(temp_dir), "--cache", str(cache_path)]):
+                main()
+        assert exc_info.value.code == 1
+
+
 def test_cli_with_options(temp_dir, capsys):
     """Test the CLI with various command-line options.
 
@@ -91,6 +155,7 @@ def test_cli_with_options(temp_dir, capsys):
     captured = capsys.readouterr()
     # Check for the new rich-formatted output
     assert "Duplicate set" in captured.out
+    assert "Biggest Space Wasters" in captured.out
     assert str(temp_dir / "file1.txt") in captured.out
     assert str(temp_dir / "file2.txt") in captured.out
     assert str(excluded_dir / "excluded.txt") not in captured.out  # Verify excluded dir is respected
@@ -130,7 +195,7 @@ def test_cli_dry_run(temp_dir, capsys):
     """Test the dry run functionality.
 
     Verifies that the program correctly shows what would be scanned
-    without actually processing any files.
+    without actually processing any files or creating the hash cache.
 
     Args:
         temp_dir: Pytest fixture providing a temporary directory
@@ -148,11 +213,14 @@ def test_cli_dry_run(temp_dir, capsys):
             ".log",
             "-m",
             "1MB",
+            "--cache",
+            str(temp_dir / "hashes.db"),
         ],
     ):
         main()
 
     captured = capsys.readouterr()
+    assert not (temp_dir / "hashes.db").exists()
     assert "DRY RUN" in captured.out
     assert str(temp_dir) in captured.out
     assert "excluded" in captured.out
@@ -202,3 +270,52 @@ def test_cli_export_formats(temp_dir):
         assert header == ["Set", "Size", "File"]
         rows = list(csv_reader)
         assert len(rows) > 0
+
+
+def test_export_to_file_sets(temp_dir):
+    """Test exporting an iterable of (size, paths) duplicate sets.
+
+    Verifies that every format numbers and sizes the sets consistently.
+
+    Args:
+        temp_dir: Pytest fixture providing a temporary directory
+    """
+    duplicate_sets = [(10, ["/a/one", "/b/one"]), (20, ["/a/two", "/b/two", "/c/two"])]
+
+    csv_file = temp_dir / "sets.csv"
+    export_to_file(iter(duplicate_sets), str(csv_file), "csv")
+    with open(csv_file) as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == ["Set", "Size", "File"]
+    assert rows[1:] == [
+        ["1", "10", "/a/one"],
+        ["1", "10", "/b/one"],
+        ["2", "20", "/a/two"],
+        ["2", "20", "/b/two"],
+        ["2", "20", "/c/two"],
+    ]
+
+    json_file = temp_dir / "sets.json"
+    export_to_file(iter(duplicate_sets), str(json_file), "json")
+    with open(json_file) as f:
+        assert json.load(f) == {"duplicate_sets": [{"size": size, "files": files} for size, files in duplicate_sets]}
+
+    txt_file = temp_dir / "sets.txt"
+    export_to_file(iter(duplicate_sets), str(txt_file), "txt")
+    content = txt_file.read_text()
+    assert content.count("Duplicate set") == 2
+    assert "  /c/two\n" in content
+
+
+def test_export_to_file_json_undecodable_names(temp_dir):
+    """Test JSON export of file names that are not valid in the file system encoding.
+
+    Args:
+        temp_dir: Pytest fixture providing a temporary directory
+    """
+    duplicate_sets = [(10, ["/a/caf\udce9", "/b/caf\udce9"])]
+
+    json_file = temp_dir / "sets.json"
+    export_to_file(duplicate_sets, str(json_file), "json")
+    with open(json_file) as f:
+        assert json.load(f) == {"duplicate_sets": [{"size": 10, "files": ["/a/caf\udce9", "/b/caf\udce9"]}]}
@@ -1,9 +1,12 @@
+import hashlib
+import os
 import tempfile
 from pathlib import Path
 
 import pytest
 
-from main import FileProcessor
+import main
+from main import FileProcessor, SizeParser
 
 
 @pytest.fixture
@@ -28,6 +31,31 @@ def create_test_file(path: Path, content: str) -> None:
     path.write_text(content)
 
 
+@pytest.mark.parametrize(
+    "size_str, expected",
+    [("0B", 0), ("100", 100), ("1b", 1), ("10KB", 10 * 1024), ("5mb", 5 * 1024**2), ("1GB", 1024**3)],
+)
+def test_parse_size(size_str, expected):
+    """Test conversion of human-readable sizes to bytes.
+
+    Args:
+        size_str: Size string to parse
+        expected: Expected size in bytes
+    """
+    assert SizeParser.parse_size(size_str) == expected
+
+
+@pytest.mark.parametrize("size_str", ["", "B", "KB", "10K", "1.5MB", "10XB", "MB10"])
+def test_parse_size_invalid(size_str):
+    """Test that malformed sizes are rejected.
+
+    Args:
+        size_str: Size string to parse
+    """
+    with pytest.raises(ValueError):
+        SizeParser.parse_size(size_str)
+
+
 def test_calculate_file_hash(temp_dir):
     """Test the file hash calculation functionality.
 
@@ -55,13 +83,180 @@ def test_calculate_file_hash(temp_dir):
     assert hash1 != hash3
 
 
+def test_calculate_file_hash_algorithms(temp_dir):
+    """Test hashing with an explicitly selected algorithm.
+
+    Verifies that:
+    1. hashlib-backed algorithms produce the standard digest
+    2. Unknown algorithms are rejected
+
+    Args:
+        temp_dir: Pytest fixture providing a temporary directory
+    """
+    test_file = temp_dir / "test.txt"
+    create_test_file(test_file, "Hello, World!")
+
+    processor = FileProcessor(hash_algorithm="md5")
+    assert processor.calculate_file_hash(str(test_file)) == hashlib.md5(b"Hello, World!").hexdigest()
+
+    processor = FileProcessor(hash_algorithm="sha256")
+    assert processor.calculate_file_hash(str(test_file)) == hashlib.sha256(b"Hello, World!").hexdigest()
+
+    with pytest.raises(ValueError):
+        FileProcessor(hash_algorithm="crc32")
+
+
+@pytest.mark.parametrize("hash_algorithm, module", [("blake3", "blake3"), ("xxh3", "xxhash")])
+def test_calculate_file_hash_optional_algorithms(temp_dir, hash_algorithm, module):
+    """Test hashing with the algorithms provided by optional packages.
+
+    Args:
+        temp_dir: Pytest fixture providing a temporary directory
+        hash_algorithm: Algorithm under test
+        module: Optional package providing the algorithm
+    """
+    pytest.importorskip(module)
+    test_file = temp_dir / "test.txt"
+    create_test_file(test_file, "Hello, World!")
+
+    processor = FileProcessor(hash_algorithm=hash_algorithm)
+    hash1 = processor.calculate_file_hash(str(test_file))
+    assert hash1 == processor.calculate_file_hash(str(test_file))
+
+    create_test_file(test_file, "Hello, World?")
+    assert hash1 != processor.calculate_file_hash(str(test_file))
+
+
+def test_calculate_file_digest_known_size(temp_dir):
+    """Test that passing the size from the scan does not change the digest.
+
+    Args:
+        temp_dir: Pytest fixture providing a temporary directory
+    """
+    test_file = temp_dir / "test.txt"
+    create_test_file(test_file, "Hello, World!")
+
+    processor = FileProcessor(hash_algorithm="md5")
+    assert processor.calculate_file_digest(str(test_file), 13) == hashlib.md5(b"Hello, World!").digest()
+    assert processor.calculate_file_digest(str(test_file), 13) == processor.calculate_file_digest(str(test_file))
+
+
+def test_calculate_file_hash_block_reads(temp_dir):
+    """Test block-wise hashing through the reusable per-thread buffer.
+
+    Args:
+        temp_dir: Pytest fixture providing a temporary directory
+    """
+    test_file = temp_dir / "blocks.bin"
+    test_file.write_bytes(b"0123456789" * 10000)
+
+    processor = FileProcessor(block_size=4096, hash_algorithm="md5")
+    assert processor.calculate_file_hash(str(test_file)) == hashlib.md5(b"0123456789" * 10000).hexdigest()
+    assert processor.calculate_file_hash(str(test_file)) == hashlib.md5(b"0123456789" * 10000).hexdigest()
+    assert processor.read_buffer() is processor.read_buffer()
+    assert len(processor.read_buffer()) == 4096
+
+
+@pytest.mark.skipif(not hasattr(os, "posix_fadvise"), reason="requires posix_fadvise")
+def test_calculate_file_hash_drop_page_cache(temp_dir, monkeypatch):
+    """Test that hashed files are evicted from the page cache only when requested.
+
+    Args:
+        temp_dir: Pytest fixture providing a temporary directory
+        monkeypatch: Pytest fixture for recording posix_fadvise calls
+    """
+    test_file = temp_dir / "blocks.bin"
+    test_file.write_bytes(b"0123456789" * 10000)
+    advice = []
+    posix_fadvise = os.posix_fadvise
+    monkeypatch.setattr(os, "posix_fadvise", lambda *args: advice.append(args[3]) or posix_fadvise(*args))
+
+    processor = FileProcessor(block_size=4096, hash_algorithm="md5")
+    processor.calculate_file_hash(str(test_file))
+    assert os.POSIX_FADV_DONTNEED not in advice
+
+    processor = FileProcessor(block_size=4096, hash_algorithm="md5", drop_page_cache=True)
+    assert processor.calculate_file_hash(str(test_file)) == hashlib.md5(b"0123456789" * 10000).hexdigest()
+    assert advice[-1] == os.POSIX_FADV_DONTNEED
+
+
+def test_calculate_file_hash_mmap(temp_dir, monkeypatch):
+    """Test that memory-mapped hashing matches block-wise hashing.
+
+    Args:
+        temp_dir: Pytest fixture providing a temporary directory
+        monkeypatch: Pytest fixture for overriding the mmap threshold
+    """
+    test_file = temp_dir / "large.bin"
+    test_file.write_bytes(b"0123456789" * 10000)
+    empty_file = temp_dir / "empty.bin"
+    empty_file.write_bytes(b"")
+
+    processor = FileProcessor(hash_algorithm="md5")
+    expected = processor.calculate_file_hash(str(test_file))
+    assert expected == hashlib.md5(b"0123456789" * 10000).hexdigest()
+
+    monkeypatch.setattr(main, "MMAP_THRESHOLD", 0)
+    assert processor.calculate_file_hash(str(test_file)) == expected
+    assert processor.calculate_file_hash(str(empty_file)) == hashlib.md5(b"").hexdigest()
+
+
+def test_calculate_file_hash_blake3_mmap(temp_dir, monkeypatch):
+    """Test that BLAKE3's update_mmap path matches its block-wise hashing.
+
+    Args:
+        temp_dir: Pytest fixture providing a temporary directory
+        monkeypatch: Pytest fixture for overriding the mmap threshold
+    """
+    pytest.importorskip("blake3")
+    test_file = temp_dir / "large.bin"
+    test_file.write_bytes(b"0123456789" * 10000)
+
+    processor = FileProcessor(hash_algorithm="blake3")
+    expected = processor.calculate_file_hash(str(test_file))
+
+    monkeypatch.setattr(main, "MMAP_THRESHOLD", 0)
+    assert processor.calculate_file_hash(str(test_file)) == expected
+
+
+def test_calculate_file_digest_p8(temp_dir, monkeypatch):
+    """Test the lane-parallel hash used for very large files.
+
+    Verifies that:
+    1. Identical files produce the same lane-parallel hash
+    2. A single changed byte changes the hash
+    3. process_file dispatches to it above the size threshold
+    4. A file emptied since the scan is logged and skipped instead of raising
+
+    Args:
+        temp_dir: Pytest fixture providing a temporary directory
+        monkeypatch: Pytest fixture for overriding the size threshold
+    """
+    content = bytes(range(256)) * 100
+    (temp_dir / "a.bin").write_bytes(content)
+    (temp_dir / "b.bin").write_bytes(content)
+    (temp_dir / "c.bin").write_bytes(content[:-1] + b"x")
+
+    processor = FileProcessor(hash_algorithm="md5")
+    digest_a = processor.calculate_file_digest_p8(str(temp_dir / "a.bin"))
+    assert digest_a == processor.calculate_file_digest_p8(str(temp_dir / "b.bin"))
+    assert digest_a != processor.calculate_file_digest_p8(str(temp_dir / "c.bin"))
+
+    monkeypatch.setattr(main, "PARALLEL_HASH_THRESHOLD", 0)
+    result = processor.process_file((str(temp_dir / "a.bin"), len(content), 0))
+    assert result[0] == digest_a
+
+    (temp_dir / "c.bin").write_bytes(b"")
+    assert processor.hash_file(str(temp_dir / "c.bin"), len(content)) is None
+
+
 def test_process_file(temp_dir):
     """Test the file processing functionality with size filtering.
 
     Verifies that:
     1. Files smaller than minimum size are filtered out (return None)
     2. Files larger than minimum size are processed correctly
-    3. The returned tuple contains correct types (str, str, int)
+    3. The returned tuple contains correct types (bytes, str, int)
 
     Args:
         temp_dir: Pytest fixture providing a temporary directory
@@ -70,20 +265,95 @@ def test_process_file(temp_dir):
     # Test with file smaller than min_size
     small_file = temp_dir / "small.txt"
     create_test_file(small_file, "small")
-    result = processor.process_file((str(small_file), 100))
+    result = processor.process_file((str(small_file), len("small"), 100))
     assert result is None
 
     # Test with file larger than min_size
     large_file = temp_dir / "large.txt"
     create_test_file(large_file, "large" * 100)
-    result = processor.process_file((str(large_file), 10))
+    result = processor.process_file((str(large_file), len("large" * 100), 10))
     assert result is not None
     assert len(result) == 3
-    assert isinstance(result[0], str)  # hash
+    assert isinstance(result[0], bytes)  # digest
     assert isinstance(result[1], str)  # path
     assert isinstance(result[2], int)  # size
 
 
+def test_process_file_head(temp_dir):
+    """Test hashing of the start, middle and end sample of a file.
+
+    Verifies that:
+    1. For small files the sample hash equals the full file hash
+    2. Files differing only between the sampled windows share a sample hash
+    3. Files differing only in their last byte do not
+
+    Args:
+        temp_dir: Pytest fixture providing a temporary directory
+    """
+    processor = FileProcessor()
+    small_file = temp_dir / "small.txt"
+    create_test_file(small_file, "small")
+    size, head_hash, path = processor.process_file_head((str(small_file), 5))
+    assert (size, path) == (5, str(small_file))
+    assert head_hash == processor.calculate_file_digest(str(small_file))
+
+    block = b"x" * main.HEAD_HASH_SIZE
+    (temp_dir / "a.bin").write_bytes(block + b"a" + block * 2 + b"z")
+    (temp_dir / "b.bin").write_bytes(block + b"b" + block * 2 + b"z")
+    (temp_dir / "c.bin").write_bytes(block + b"b" + block * 2 + b"y")
+    size = 3 * main.HEAD_HASH_SIZE + 2
+    head_a = processor.process_file_head((str(temp_dir / "a.bin"), size))[1]
+    head_b = processor.process_file_head((str(temp_dir / "b.bin"), size))[1]
+    head_c = processor.process_file_head((str(temp_dir / "c.bin"), size))[1]
+    assert head_a == head_b
+    assert head_b != head_c
+
+
+def test_process_batch(temp_dir):
+    """Test that a batch of files is hashed and grouped inside the worker.
+
+    Args:
+        temp_dir: Pytest fixture providing a temporary directory
+    """
+    processor = FileProcessor()
+    create_test_file(temp_dir / "dup1.txt", "duplicate")
+    create_test_file(temp_dir / "dup2.txt", "duplicate")
+    create_test_file(temp_dir / "other.txt", "different")
+    batch = [(str(temp_dir / name), 9) for name in ("dup1.txt", "dup2.txt", "other.txt")]
+
+    hash_map = processor.process_batch(batch)
+
+    assert len(hash_map) == 2
+    assert hash_map[(9, processor.calculate_file_digest(str(temp_dir / "dup1.txt")))] == [
+        str(temp_dir / "dup1.txt"),
+        str(temp_dir / "dup2.txt"),
+    ]
+
+
+def test_scan_directory(temp_dir):
+    """Test recursive directory listing with file sizes.
+
+    Verifies that:
+    1. Files in nested directories are listed with their sizes
+    2. Dot directories are skipped unless requested
+
+    Args:
+        temp_dir: Pytest fixture providing a temporary directory
+    """
+    processor = FileProcessor()
+    (temp_dir / "nested").mkdir()
+    (temp_dir / ".hidden").mkdir()
+    create_test_file(temp_dir / "a.txt", "a")
+    create_test_file(temp_dir / "nested" / "b.txt", "bb")
+    create_test_file(temp_dir / ".hidden" / "c.txt", "ccc")
+
+    assert sorted(processor.scan_directory(str(temp_dir))) == [
+        (str(temp_dir / "a.txt"), 1),
+        (str(temp_dir / "nested" / "b.txt"), 2),
+    ]
+    assert len(list(processor.scan_directory(str(temp_dir), ignore_dot_dirs=False))) == 3
+
+
 def test_find_duplicates(temp_dir):
     """Test the duplicate file finding functionality.
 
@@ -127,7 +397,8 @@ def test_find_duplicates(temp_dir):
     assert total_size > duplicate_size
 
     # Verify the duplicate set contains exactly 3 files
-    duplicate_set = next(iter(duplicates.values()))
+    size, duplicate_set = next(iter(duplicates.values()))
+    assert size == len("duplicate")
     assert len(duplicate_set) == 3
 
     # Test with minimum size filter
@@ -136,3 +407,407 @@ def test_find_duplicates(temp_dir):
         min_size=1000000,  # 1MB
     )
     assert len(duplicates) == 0  # No files are this large
+
+
+def test_find_duplicates_digest_shared_across_sizes(temp_dir, monkeypatch):
+    """Test that duplicate sets of different sizes never overwrite each other.
+
+    The lane-parallel digest of a large file equals the plain digest of a small
+    file holding its lane digests, so neither batches nor results may be keyed
+    on the digest alone.
+
+    Args:
+        temp_dir: Pytest fixture providing a temporary directory
+        monkeypatch: Pytest fixture for shrinking the hashing thresholds
+    """
+    monkeypatch.setattr(main, "HEAD_HASH_SIZE", 1)
+    monkeypatch.setattr(main, "PARALLEL_HASH_THRESHOLD", 128)
+    large = bytes(range(200))
+    lane_size = -(-len(large) // main.PARALLEL_HASH_LANES)
+    small = b"".join(
+        hashlib.md5(large[i * lane_size : (i + 1) * lane_size]).digest() for i in range(main.PARALLEL_HASH_LANES)
+    )
+    files = {"large": large, "small": small, "filler": b"filler"}
+    for name, content in files.items():
+        for copy in range(1, 4 if name != "filler" else 3):
+            (temp_dir / f"{name}{copy}.bin").write_bytes(content)
+
+    processor = FileProcessor(hash_algorithm="md5", workers=1)
+    batch = [(str(temp_dir / "large1.bin"), len(large)), (str(temp_dir / "small1.bin"), len(small))]
+    assert sorted(size for size, _ in processor.process_batch(batch)) == [len(small), len(large)]
+
+    # With one worker the eight files are hashed in batches of two, so a
+    # large and a small file share the second batch
+    duplicates, _, duplicate_size, _ = processor.find_duplicates(str(temp_dir))
+    assert sorted((size, len(paths)) for size, paths in duplicates.values()) == [
+        (len(files["filler"]), 2),
+        (len(small), 3),
+        (len(large), 3),
+    ]
+    assert duplicate_size == 2 * len(small) + 2 * len(large) + len(files["filler"])
+
+
+def test_find_duplicates_unique_sizes(temp_dir):
+    """Test that files with a unique size are counted but never reported.
+
+    Args:
+        temp_dir: Pytest fixture providing a temporary directory
+    """
+    processor = FileProcessor()
+    create_test_file(temp_dir / "a.txt", "a")
+    create_test_file(temp_dir / "bb.txt", "bb")
+    create_test_file(temp_dir / "dup1.txt", "duplicate")
+    create_test_file(temp_dir / "dup2.txt", "duplicate")
+
+    duplicates, total_size, duplicate_size, files_processed = processor.find_duplicates(str(temp_dir))
+
+    assert files_processed == 4
+    assert total_size == 1 + 2 + 9 + 9
+    assert duplicate_size == 9
+    assert len(duplicates) == 1
+
+
+def test_find_duplicates_empty_files(temp_dir, monkeypatch):
+    """Test that empty files are reported as duplicates without being opened.
+
+    Args:
+        temp_dir: Pytest fixture providing a temporary directory
+        monkeypatch: Pytest fixture used to detect file reads
+    """
+    processor = FileProcessor()
+    create_test_file(temp_dir / "empty1.txt", "")
+    create_test_file(temp_dir / "empty2.txt", "")
+
+    def fail(*args):
+        raise AssertionError("empty files should not be read")
+
+    monkeypatch.setattr(processor, "process_file_head", fail)
+    duplicates, total_size, duplicate_size, files_processed = processor.find_duplicates(str(temp_dir))
+
+    assert files_processed == 2
+    assert total_size == 0
+    assert duplicate_size == 0
+    assert len(duplicates) == 1
+    size, duplicate_set = next(iter(duplicates.values()))
+    assert size == 0
+    assert sorted(duplicate_set) == [str(temp_dir / "empty1.txt"), str(temp_dir / "empty2.txt")]
+
+
+def test_find_duplicates_same_head(temp_dir):
+    """Test that large files sharing their sampled windows are not duplicates.
+
+    Args:
+        temp_dir: Pytest fixture providing a temporary directory
+    """
+    processor = FileProcessor()
+    block = b"x" * main.HEAD_HASH_SIZE
+    (temp_dir / "a.bin").write_bytes(block + b"a" + block * 2)
+    (temp_dir / "b.bin").write_bytes(block + b"b" + block * 2)
+    (temp_dir / "c.bin").write_bytes(block + b"b" + block * 2)
+
+    duplicates, _, _, _ = processor.find_duplicates(str(temp_dir))
+
+    assert len(duplicates) == 1
+    assert sorted(next(iter(duplicates.values()))[1]) == [str(temp_dir / "b.bin"), str(temp_dir / "c.bin")]
+
+
+def test_file_processor_workers():
+    """Test that the number of hashing workers can be set explicitly."""
+    assert FileProcessor(workers=4).max_workers == 4
+    assert FileProcessor(workers_mode="processes", workers=2).max_workers == 2
+    assert FileProcessor().max_workers >= 1
+
+    with pytest.raises(ValueError):
+        FileProcessor(workers=0)
+
+
+@pytest.mark.parametrize("workers_mode", ["threads", "processes"])
+def test_find_duplicates_workers_mode(temp_dir, workers_mode):
+    """Test that thread and process pools find the same duplicates.
+
+    Args:
+        temp_dir: Pytest fixture providing a temporary directory
+        workers_mode: Worker pool type under test
+    """
+    processor = FileProcessor(workers_mode=workers_mode)
+    create_test_file(temp_dir / "dup1.txt", "duplicate")
+    create_test_file(temp_dir / "dup2.txt", "duplicate")
+    create_test_file(temp_dir / "other.txt", "different")
+
+    duplicates, _, _, files_processed = processor.find_duplicates(str(temp_dir))
+
+    assert files_processed == 3
+    assert sorted(next(iter(duplicates.values()))[1]) == [str(temp_dir / "dup1.txt"), str(temp_dir / "dup2.txt")]
+
+
+def test_find_duplicates_verify(temp_dir, monkeypatch):
+    """Test that files sharing a digest are only reported once their contents match.
+
+    Args:
+        temp_dir: Pytest fixture providing a temporary directory
+        monkeypatch: Pytest fixture for forcing digest collisions
+    """
+
+    class CollidingHasher:
+        def update(self, data):
+            pass
+
+        def digest(self):
+            return b"collision"
+
+    for name, content in [("a1", "aaa"), ("a2", "aaa"), ("b1", "bbb"), ("b2", "bbb"), ("c1", "ccc")]:
+        create_test_file(temp_dir / f"{name}.txt", content)
+
+    processor = FileProcessor()
+    monkeypatch.setattr(processor, "new_hasher", lambda size=0: CollidingHasher())
+    duplicates, _, duplicate_size, _ = processor.find_duplicates(str(temp_dir))
+    assert len(duplicates) == 1
+    assert duplicate_size == 12
+
+    processor = FileProcessor(verify=True)
+    monkeypatch.setattr(processor, "new_hasher", lambda size=0: CollidingHasher())
+    duplicates, _, duplicate_size, _ = processor.find_duplicates(str(temp_dir))
+    assert sorted(sorted(paths) for _, paths in duplicates.values()) == [
+        [str(temp_dir / "a1.txt"), str(temp_dir / "a2.txt")],
+        [str(temp_dir / "b1.txt"), str(temp_dir / "b2.txt")],
+    ]
+    assert duplicate_size == 6
+
+
+def test_confirm_duplicates(temp_dir, monkeypatch):
+    """Test splitting a set of files into groups of identical files.
+
+    Args:
+        temp_dir: Pytest fixture providing a temporary directory
+        monkeypatch: Pytest fixture for shrinking the comparison window and block size
+    """
+    monkeypatch.setattr(main, "VERIFY_OPEN_FILES", 2)
+    monkeypatch.setattr(main, "VERIFY_BLOCK_SIZE", 2)
+    for name, content in [("a1", "aaab"), ("b1", "aaac"), ("a2", "aaab"), ("b2", "aaac"), ("c1", "cccc")]:
+        create_test_file(temp_dir / f"{name}.txt", content)
+    paths = [str(temp_dir / f"{name}.txt") for name in ("a1", "b1", "missing", "a2", "b2", "c1")]
+
+    processor = FileProcessor()
+    assert processor.confirm_duplicates((4, paths)) == [
+        [str(temp_dir / "a1.txt"), str(temp_dir / "a2.txt")],
+        [str(temp_dir / "b1.txt"), str(temp_dir / "b2.txt")],
+    ]
+
+
+def test_find_duplicates_exclusions(temp_dir):
+    """Test directory and extension exclusion matching.
+
+    Verifies that:
+    1. Excluded directories are pruned together with their subdirectories
+    2. Sibling directories sharing the excluded name as a prefix are still scanned
+    3. Extensions match case-insensitively, with or without a leading dot
+    4. A scan rooted below an excluded directory is excluded as a whole
+
+    Args:
+        temp_dir: Pytest fixture providing a temporary directory
+    """
+    processor = FileProcessor()
+    (temp_dir / "skip" / "nested").mkdir(parents=True)
+    (temp_dir / "skipper").mkdir()
+    create_test_file(temp_dir / "skip" / "a.txt", "duplicate")
+    create_test_file(temp_dir / "skip" / "nested" / "b.txt", "duplicate")
+    create_test_file(temp_dir / "skipper" / "c.txt", "duplicate")
+    create_test_file(temp_dir / "d.txt", "duplicate")
+    create_test_file(temp_dir / "e.LOG", "duplicate")
+    create_test_file(temp_dir / "f.tmp", "duplicate")
+
+    duplicates, _, _, files_processed = processor.find_duplicates(
+        str(temp_dir),
+        exclude_dirs=[str(temp_dir / "skip")],
+        exclude_extensions=[".log", "tmp"],
+    )
+
+    assert files_processed == 2
+    assert sorted(next(iter(duplicates.values()))[1]) == [str(temp_dir / "d.txt"), str(temp_dir / "skipper" / "c.txt")]
+
+    # A scan rooted inside an excluded directory finds nothing
+    assert processor.find_duplicates(str(temp_dir / "skip" / "nested"), exclude_dirs=[str(temp_dir / "skip")])[3] == 0
+
+
+def test_find_duplicates_many_sizes(temp_dir, monkeypatch):
+    """Test that duplicate sets of every size survive both hashing passes.
+
+    Args:
+        temp_dir: Pytest fixture providing a temporary directory
+        monkeypatch: Pytest fixture for shrinking the head hash and batch sizes
+    """
+    monkeypatch.setattr(main, "HEAD_HASH_SIZE", 1)
+    monkeypatch.setattr(main, "HEAD_BATCH_SIZE", 4)
+    processor = FileProcessor()
+    for size in range(2, 12):
+        create_test_file(temp_dir / f"dup{size}_a.txt", "d" * size)
+        create_test_file(temp_dir / f"dup{size}_b.txt", "d" * size)
+        create_test_file(temp_dir / f"other{size}.txt", "d" * (size - 1) + "x")
+
+    duplicates, _, duplicate_size, files_processed = processor.find_duplicates(str(temp_dir))
+
+    assert files_processed == 30
+    assert sorted(size for size, _ in duplicates.values()) == list(range(2, 12))
+    assert all(len(paths) == 2 for _, paths in duplicates.values())
+    assert duplicate_size == sum(range(2, 12))
+
+
+def test_find_duplicates_cache(temp_dir, monkeypatch):
+    """Test that stored hashes are reused until a file changes.
+
+    Args:
+        temp_dir: Pytest fixture providing a temporary directory
+        monkeypatch: Pytest fixture for shrinking the head hash size and detecting reads
+    """
+    monkeypatch.setattr(main, "HEAD_HASH_SIZE", 1)
+    scan_dir = temp_dir / "scan"
+    scan_dir.mkdir()
+    cache_path = str(temp_dir / "hashes.db")
+    create_test_file(scan_dir / "a.txt", "same content")
+    create_test_file(scan_dir / "b.txt", "same content")
+    create_test_file(scan_dir / "c.txt", "same_content")
+
+    processor = FileProcessor(cache_path=cache_path)
+    duplicates, _, _, _ = processor.find_duplicates(str(scan_dir))
+    assert [sorted(paths) for _, paths in duplicates.values()] == [[str(scan_dir / "a.txt"), str(scan_dir / "b.txt")]]
+
+    def fail(filepath, file_size):
+        raise AssertionError(f"{filepath} should not be hashed again")
+
+    processor = FileProcessor(cache_path=cache_path)
+    monkeypatch.setattr(processor, "hash_file", fail)
+    assert processor.find_duplicates(str(scan_dir))[0] == duplicates
+
+    # Same size, new content and modification time: only that file is hashed again
+    create_test_file(scan_dir / "c.txt", "same content")
+    os.utime(scan_dir / "c.txt", ns=(0, 0))
+    processor = FileProcessor(cache_path=cache_path)
+    hashed = []
+    hash_file = processor.hash_file
+    monkeypatch.setattr(processor, "hash_file", lambda *args: hashed.append(args[0]) or hash_file(*args))
+    duplicates, _, _, _ = processor.find_duplicates(str(scan_dir))
+    assert hashed == [str(scan_dir / "c.txt")]
+    assert [sorted(paths) for _, paths in duplicates.values()] == [
+        [str(scan_dir / "a.txt"), str(scan_dir / "b.txt"), str(scan_dir / "c.txt")]
+    ]
+
+
+def test_find_duplicates_cache_relative_root(temp_dir, monkeypatch):
+    """Test that cached hashes of a relative scan root are not reused for another working directory.
+
+    Args:
+        temp_dir: Pytest fixture providing a temporary directory
+        monkeypatch: Pytest fixture for shrinking the head hash size and changing directory
+    """
+    monkeypatch.setattr(main, "HEAD_HASH_SIZE", 1)
+    cache_path = str(temp_dir / "hashes.db")
+    # Same names, sizes and modification times; the files in y differ outside the sampled bytes
+    for tree, content in (("x", "abcdefgh"), ("y", "abcXefgh")):
+        (temp_dir / tree / "data").mkdir(parents=True)
+        create_test_file(temp_dir / tree / "data" / "a.txt", "abcdefgh")
+        create_test_file(temp_dir / tree / "data" / "b.txt", content)
+        for name in ("a.txt", "b.txt"):
+            os.utime(temp_dir / tree / "data" / name, ns=(0, 0))
+
+    monkeypatch.chdir(temp_dir / "x")
+    duplicates, _, _, _ = FileProcessor(cache_path=cache_path).find_duplicates("data")
+    assert len(duplicates) == 1
+
+    monkeypatch.chdir(temp_dir / "y")
+    duplicates, _, _, _ = FileProcessor(cache_path=cache_path).find_duplicates("data")
+    assert duplicates == {}
+
+
+def test_find_duplicates_links(temp_dir):
+    """Test that links to the same file are not reported as duplicates.
+
+    Verifies that:
+    1. Hard links to one file are only scanned once
+    2. Symbolic links are skipped unless follow_symlinks is set
+    3. Followed symbolic links are deduplicated against their target
+
+    Args:
+        temp_dir: Pytest fixture providing a temporary directory
+    """
+    processor = FileProcessor()
+    create_test_file(temp_dir / "original.txt", "duplicate")
+    (temp_dir / "hardlink.txt").hardlink_to(temp_dir / "original.txt")
+    (temp_dir / "symlink.txt").symlink_to(temp_dir / "original.txt")
+
+    duplicates, _, _, files_processed = processor.find_duplicates(str(temp_dir))
+    assert duplicates == {}
+    assert files_processed == 1
+    assert processor.hardlinks_skipped == 1
+
+    duplicates, _, _, files_processed = processor.find_duplicates(str(temp_dir), follow_symlinks=True)
+    assert duplicates == {}
+    assert files_processed == 1
+    assert processor.hardlinks_skipped == 2
+
+    create_test_file(temp_dir / "copy.txt", "duplicate")
+    duplicates, _, _, files_processed = processor.find_duplicates(str(temp_dir))
+    assert files_processed == 2
+    assert len(duplicates) == 1
+
+
+def test_find_duplicates_zero_inode(temp_dir, monkeypatch):
+    """Test that entries reporting no inode number are not deduplicated.
+
+    On Windows DirEntry.stat() returns st_ino and st_dev as 0, so following
+    symlinks must not treat every file as a link to the first one.
+
+    Args:
+        temp_dir: Pytest fixture providing a temporary directory
+        monkeypatch: Pytest fixture for patching os.scandir and os.stat
+    """
+
+    def zero_inode(stat):
+        return os.stat_result((stat.st_mode, 0, 0, 0) + tuple(stat)[4:])
+
+    class ZeroInodeEntry:
+        def __init__(self, entry):
+            self.entry = entry
+            self.name = entry.name
+            self.path = entry.path
+
+        def is_dir(self, follow_symlinks=True):
+            return self.entry.is_dir(follow_symlinks=follow_symlinks)
+
+        def is_file(self):
+            return self.entry.is_file()
+
+        def is_symlink(self):
+            return self.entry.is_symlink()
+
+        def stat(self):
+            return zero_inode(self.entry.stat())
+
+    class ZeroInodeScandir:
+        def __init__(self, path):
+            self.entries = scandir(path)
+
+        def __enter__(self):
+            return (ZeroInodeEntry(entry) for entry in self.entries.__enter__())
+
+        def __exit__(self, *args):
+            return self.entries.__exit__(*args)
+
+    scandir = os.scandir
+    create_test_file(temp_dir / "a.txt", "duplicate")
+    create_test_file(temp_dir / "b.txt", "duplicate")
+    processor = FileProcessor()
+
+    # The inode is taken from os.stat() instead
+    monkeypatch.setattr(os, "scandir", ZeroInodeScandir)
+    duplicates, _, _, files_processed = processor.find_duplicates(str(temp_dir), follow_symlinks=True)
+    assert files_processed == 2
+    assert processor.hardlinks_skipped == 0
+    assert len(duplicates) == 1
+
+    # Without any inode number the files are never treated as links
+    stat = os.stat
+    monkeypatch.setattr(os, "stat", lambda path, *args, **kwargs: zero_inode(stat(path, *args, **kwargs)))
+    duplicates, _, _, files_processed = processor.find_duplicates(str(temp_dir), follow_symlinks=True)
+    assert files_processed == 2
+    assert processor.hardlinks_skipped == 0
+    assert len(duplicates) == 1